@@ -1,86 +1,219 @@
 """
 Pytest configuration and fixtures for FastAPI tests.
+
+The suite can optionally be run in parallel with
+``pytest -n auto --dist=loadscope``. Each pytest-xdist worker is a separate
+process with its own copy of the in-memory ``activities`` database, and
+``--dist=loadscope`` keeps every test class on a single worker.
 """
+import asyncio
+import json
+from urllib.parse import quote, unquote
+
+import httpx
 import pytest
 from fastapi.testclient import TestClient
-from src.app import app
+from src.app import activities, app
 
 
-@pytest.fixture
+# Initial activity details, which the API never changes
+_IMMUTABLE_META = {
+    "Chess Club": {
+        "description": "Learn strategies and compete in chess tournaments",
+        "schedule": "Fridays, 3:30 PM - 5:00 PM",
+        "max_participants": 12
+    },
+    "Programming Class": {
+        "description": "Learn programming fundamentals and build software projects",
+        "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
+        "max_participants": 20
+    },
+    "Gym Class": {
+        "description": "Physical education and sports activities",
+        "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
+        "max_participants": 30
+    },
+    "Basketball Team": {
+        "description": "Competitive basketball team for intramural and tournament play",
+        "schedule": "Mondays and Wednesdays, 4:00 PM - 5:30 PM",
+        "max_participants": 15
+    },
+    "Track and Field": {
+        "description": "Sprint, distance, and field events for all skill levels",
+        "schedule": "Tuesdays and Thursdays, 4:00 PM - 5:30 PM",
+        "max_participants": 25
+    },
+    "Art Studio": {
+        "description": "Explore painting, drawing, and sculpture techniques",
+        "schedule": "Mondays and Fridays, 3:30 PM - 5:00 PM",
+        "max_participants": 18
+    },
+    "Drama Club": {
+        "description": "Perform in plays and musicals throughout the school year",
+        "schedule": "Wednesdays, 3:30 PM - 5:00 PM",
+        "max_participants": 30
+    },
+    "Debate Team": {
+        "description": "Develop critical thinking and public speaking skills",
+        "schedule": "Tuesdays, 3:30 PM - 4:30 PM",
+        "max_participants": 16
+    },
+    "Science Club": {
+        "description": "Conduct experiments and explore scientific concepts",
+        "schedule": "Thursdays, 3:30 PM - 4:30 PM",
+        "max_participants": 20
+    }
+}
+
+# Initial participants of each activity, the only state tests mutate
+_PARTICIPANTS = {
+    "Chess Club": ["michael@mergington.edu", "daniel@mergington.edu"],
+    "Programming Class": ["emma@mergington.edu", "sophia@mergington.edu"],
+    "Gym Class": ["john@mergington.edu", "olivia@mergington.edu"],
+    "Basketball Team": ["james@mergington.edu"],
+    "Track and Field": ["sarah@mergington.edu", "alex@mergington.edu"],
+    "Art Studio": ["grace@mergington.edu"],
+    "Drama Club": ["lucas@mergington.edu", "maya@mergington.edu"],
+    "Debate Team": ["rachel@mergington.edu"],
+    "Science Club": ["david@mergington.edu", "natalie@mergington.edu"]
+}
+
+# Build the database once; afterwards only participants lists are restored
+activities.clear()
+activities.update({
+    name: {**details, "participants": _PARTICIPANTS[name][:]}
+    for name, details in _IMMUTABLE_META.items()
+})
+
+
+def _restore_participants(names):
+    """Restore the named participants lists in place to their initial contents."""
+    for name in names:
+        activities[name]["participants"][:] = _PARTICIPANTS[name]
+
+
+# Activities whose participants a test changed, cleared once restored
+_dirty = set()
+
+
+class _ASGIResponse:
+    """Minimal response collected from a direct ASGI call."""
+
+    def __init__(self, status_code, headers, body):
+        self.status_code = status_code
+        self.headers = headers
+        self.body = body
+
+    def json(self):
+        return json.loads(self.body)
+
+
+async def _call(method, url):
+    """Invoke the application in-process, bypassing httpx entirely."""
+    path, _, query = url.partition("?")
+    path = unquote(path)
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": quote(path).encode(),
+        "root_path": "",
+        "query_string": query.encode(),
+        "headers": [],
+        "server": ("test", 80),
+    }
+    requested = False
+    response = {"body": []}
+
+    async def receive():
+        nonlocal requested
+        if requested:
+            return {"type": "http.disconnect"}
+        requested = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = {
+                key.decode("latin-1"): value.decode("latin-1")
+                for key, value in message.get("headers", [])
+            }
+        elif message["type"] == "http.response.body":
+            response["body"].append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return _ASGIResponse(response["status"], response["headers"], b"".join(response["body"]))
+
+
+class _ASGIClient:
+    """Synchronous client that drives ``_call`` on a persistent event loop."""
+
+    def __init__(self, loop):
+        self._loop = loop
+
+    def get(self, url):
+        return self._loop.run_until_complete(_call("GET", url))
+
+    def post(self, url):
+        return self._loop.run_until_complete(_call("POST", url))
+
+    def delete(self, url):
+        return self._loop.run_until_complete(_call("DELETE", url))
+
+
+@pytest.fixture(scope="session")
 def client():
-    """Provide a test client for the FastAPI application."""
+    """Provide a test client for the FastAPI application.
+
+    The client holds no activity state, so a single instance is shared
+    across the session.
+    """
     return TestClient(app)
 
 
+@pytest.fixture(scope="session")
+def asgi_client():
+    """Provide a lightweight client that calls the application directly.
+
+    Use ``client`` instead when full HTTP semantics such as redirect
+    handling are under test.
+    """
+    loop = asyncio.new_event_loop()
+    yield _ASGIClient(loop)
+    loop.close()
+
+
+@pytest.fixture
+def anyio_backend():
+    """Run async tests on asyncio only."""
+    return "asyncio"
+
+
+@pytest.fixture
+async def aclient():
+    """Provide an async client that calls the application in-process."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
 @pytest.fixture(autouse=True)
 def reset_activities():
-    """Reset activities to initial state before each test."""
-    from src.app import activities
-    
-    # Store original state
-    original_state = {
-        "Chess Club": {
-            "description": "Learn strategies and compete in chess tournaments",
-            "schedule": "Fridays, 3:30 PM - 5:00 PM",
-            "max_participants": 12,
-            "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
-        },
-        "Programming Class": {
-            "description": "Learn programming fundamentals and build software projects",
-            "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
-            "max_participants": 20,
-            "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
-        },
-        "Gym Class": {
-            "description": "Physical education and sports activities",
-            "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
-            "max_participants": 30,
-            "participants": ["john@mergington.edu", "olivia@mergington.edu"]
-        },
-        "Basketball Team": {
-            "description": "Competitive basketball team for intramural and tournament play",
-            "schedule": "Mondays and Wednesdays, 4:00 PM - 5:30 PM",
-            "max_participants": 15,
-            "participants": ["james@mergington.edu"]
-        },
-        "Track and Field": {
-            "description": "Sprint, distance, and field events for all skill levels",
-            "schedule": "Tuesdays and Thursdays, 4:00 PM - 5:30 PM",
-            "max_participants": 25,
-            "participants": ["sarah@mergington.edu", "alex@mergington.edu"]
-        },
-        "Art Studio": {
-            "description": "Explore painting, drawing, and sculpture techniques",
-            "schedule": "Mondays and Fridays, 3:30 PM - 5:00 PM",
-            "max_participants": 18,
-            "participants": ["grace@mergington.edu"]
-        },
-        "Drama Club": {
-            "description": "Perform in plays and musicals throughout the school year",
-            "schedule": "Wednesdays, 3:30 PM - 5:00 PM",
-            "max_participants": 30,
-            "participants": ["lucas@mergington.edu", "maya@mergington.edu"]
-        },
-        "Debate Team": {
-            "description": "Develop critical thinking and public speaking skills",
-            "schedule": "Tuesdays, 3:30 PM - 4:30 PM",
-            "max_participants": 16,
-            "participants": ["rachel@mergington.edu"]
-        },
-        "Science Club": {
-            "description": "Conduct experiments and explore scientific concepts",
-            "schedule": "Thursdays, 3:30 PM - 4:30 PM",
-            "max_participants": 20,
-            "participants": ["david@mergington.edu", "natalie@mergington.edu"]
-        }
-    }
-    
-    # Clear and repopulate activities
-    activities.clear()
-    activities.update(original_state)
-    
+    """Restore participants that the previous test changed.
+
+    After every test the participants lists are compared with the initial
+    state and only the changed ones are restored, so read-only tests skip
+    the restore entirely.
+    """
+    if _dirty:
+        _restore_participants(_dirty)
+        _dirty.clear()
     yield
-    
-    # Reset after test
-    activities.clear()
-    activities.update(original_state)
+    _dirty.update(
+        name for name, participants in _PARTICIPANTS.items()
+        if activities[name]["participants"] != participants
+    )
@@ -1,7 +1,18 @@
 """
 Unit tests for the FastAPI application.
 """
+import asyncio
+from urllib.parse import quote
+
 import pytest
+from src.app import activities
+
+_SIGNUP_URL = "/activities/{}/signup?email={}".format
+_UNREGISTER_URL = "/activities/{}/unregister?email={}".format
+_CHESS = quote("Chess Club")
+_PROGRAMMING = quote("Programming Class")
+_BASKETBALL = quote("Basketball Team")
+_NONEXISTENT = quote("Nonexistent Activity")
 
 
 class TestRootEndpoint:
@@ -17,9 +28,9 @@ class TestRootEndpoint:
 class TestActivitiesEndpoint:
     """Tests for the activities endpoint."""
     
-    def test_get_all_activities(self, client):
+    def test_get_all_activities(self, asgi_client):
         """Test retrieving all activities"""
-        response = client.get("/activities")
+        response = asgi_client.get("/activities")
         assert response.status_code == 200
         
         data = response.json()
@@ -28,9 +39,9 @@ class TestActivitiesEndpoint:
         assert "Chess Club" in data
         assert "Programming Class" in data
         
-    def test_activity_structure(self, client):
+    def test_activity_structure(self, asgi_client):
         """Test that activities have the correct structure"""
-        response = client.get("/activities")
+        response = asgi_client.get("/activities")
         data = response.json()
         
         chess_club = data["Chess Club"]
@@ -39,9 +50,9 @@ class TestActivitiesEndpoint:
         assert "max_participants" in chess_club
         assert "participants" in chess_club
         
-    def test_activities_have_participants(self, client):
+    def test_activities_have_participants(self, asgi_client):
         """Test that activities contain participant data"""
-        response = client.get("/activities")
+        response = asgi_client.get("/activities")
         data = response.json()
         
         chess_club = data["Chess Club"]
@@ -51,54 +62,34 @@ class TestActivitiesEndpoint:
 class TestSignupEndpoint:
     """Tests for the signup endpoint."""
     
-    def test_signup_successful(self, client):
+    def test_signup_successful(self, asgi_client):
         """Test successful signup for an activity"""
-        response = client.post(
-            "/activities/Chess Club/signup?email=newstudent@mergington.edu"
-        )
+        response = asgi_client.post(_SIGNUP_URL(_CHESS, "newstudent@mergington.edu"))
         assert response.status_code == 200
         
         data = response.json()
         assert "message" in data
         assert "newstudent@mergington.edu" in data["message"]
         
-    def test_signup_adds_participant(self, client):
+    def test_signup_adds_participant(self, asgi_client):
         """Test that signup actually adds participant to activity"""
-        client.post("/activities/Chess Club/signup?email=newstudent@mergington.edu")
+        asgi_client.post(_SIGNUP_URL(_CHESS, "newstudent@mergington.edu"))
         
-        response = client.get("/activities")
-        chess_club = response.json()["Chess Club"]
+        chess_club = activities["Chess Club"]
         assert "newstudent@mergington.edu" in chess_club["participants"]
         assert len(chess_club["participants"]) == 3
         
-    def test_signup_nonexistent_activity(self, client):
-        """Test signup for activity that doesn't exist"""
-        response = client.post(
-            "/activities/Nonexistent Activity/signup?email=student@mergington.edu"
-        )
-        assert response.status_code == 404
-        assert "Activity not found" in response.json()["detail"]
-        
-    def test_signup_duplicate_student(self, client):
-        """Test that student cannot sign up twice for same activity"""
-        # First signup
-        response1 = client.post(
-            "/activities/Chess Club/signup?email=newstudent@mergington.edu"
-        )
-        assert response1.status_code == 200
-        
-        # Second signup with same email
-        response2 = client.post(
-            "/activities/Chess Club/signup?email=newstudent@mergington.edu"
-        )
-        assert response2.status_code == 400
-        assert "already signed up" in response2.json()["detail"]
-        
-    def test_signup_student_already_registered(self, client):
-        """Test that already registered student cannot signup again"""
-        response = client.post(
-            "/activities/Chess Club/signup?email=michael@mergington.edu"
-        )
+    @pytest.mark.parametrize("email,preseed", [
+        ("michael@mergington.edu", False),
+        ("newstudent@mergington.edu", True),
+    ])
+    def test_signup_duplicate(self, asgi_client, email, preseed):
+        """Test that a student already signed up cannot sign up again"""
+        if preseed:
+            response = asgi_client.post(_SIGNUP_URL(_CHESS, email))
+            assert response.status_code == 200
+        
+        response = asgi_client.post(_SIGNUP_URL(_CHESS, email))
         assert response.status_code == 400
         assert "already signed up" in response.json()["detail"]
 
@@ -106,106 +97,106 @@ class TestSignupEndpoint:
 class TestUnregisterEndpoint:
     """Tests for the unregister endpoint."""
     
-    def test_unregister_successful(self, client):
+    def test_unregister_successful(self, asgi_client):
         """Test successful unregistration from an activity"""
-        response = client.delete(
-            "/activities/Chess Club/unregister?email=michael@mergington.edu"
-        )
+        response = asgi_client.delete(_UNREGISTER_URL(_CHESS, "michael@mergington.edu"))
         assert response.status_code == 200
         
         data = response.json()
         assert "message" in data
         assert "michael@mergington.edu" in data["message"]
         
-    def test_unregister_removes_participant(self, client):
+    def test_unregister_removes_participant(self, asgi_client):
         """Test that unregister actually removes participant from activity"""
-        client.delete(
-            "/activities/Chess Club/unregister?email=michael@mergington.edu"
-        )
+        asgi_client.delete(_UNREGISTER_URL(_CHESS, "michael@mergington.edu"))
         
-        response = client.get("/activities")
-        chess_club = response.json()["Chess Club"]
+        chess_club = activities["Chess Club"]
         assert "michael@mergington.edu" not in chess_club["participants"]
         assert len(chess_club["participants"]) == 1
         
-    def test_unregister_nonexistent_activity(self, client):
-        """Test unregister from activity that doesn't exist"""
-        response = client.delete(
-            "/activities/Nonexistent Activity/unregister?email=student@mergington.edu"
-        )
-        assert response.status_code == 404
-        assert "Activity not found" in response.json()["detail"]
-        
-    def test_unregister_student_not_registered(self, client):
-        """Test that unregistering non-registered student returns error"""
-        response = client.delete(
-            "/activities/Chess Club/unregister?email=notregistered@mergington.edu"
-        )
-        assert response.status_code == 400
-        assert "not registered" in response.json()["detail"]
-        
-    def test_unregister_last_participant(self, client):
+    def test_unregister_last_participant(self, asgi_client):
         """Test unregistering the last participant from an activity"""
         # Basketball Team has only one participant
-        response = client.delete(
-            "/activities/Basketball Team/unregister?email=james@mergington.edu"
-        )
+        response = asgi_client.delete(_UNREGISTER_URL(_BASKETBALL, "james@mergington.edu"))
         assert response.status_code == 200
         
         # Verify participant is removed
-        activities_response = client.get("/activities")
-        basketball = activities_response.json()["Basketball Team"]
+        basketball = activities["Basketball Team"]
         assert len(basketball["participants"]) == 0
 
 
+class TestErrorResponses:
+    """Tests for error responses from the signup and unregister endpoints."""
+    
+    @pytest.mark.parametrize("method,url,status,detail", [
+        (
+            "post",
+            _SIGNUP_URL(_NONEXISTENT, "student@mergington.edu"),
+            404,
+            "Activity not found",
+        ),
+        (
+            "delete",
+            _UNREGISTER_URL(_NONEXISTENT, "student@mergington.edu"),
+            404,
+            "Activity not found",
+        ),
+        (
+            "delete",
+            _UNREGISTER_URL(_CHESS, "notregistered@mergington.edu"),
+            400,
+            "not registered",
+        ),
+    ])
+    def test_error_responses(self, asgi_client, method, url, status, detail):
+        """Test that invalid requests return the expected error"""
+        response = getattr(asgi_client, method)(url)
+        assert response.status_code == status
+        assert detail in response.json()["detail"]
+
+
 class TestSignupAndUnregisterFlow:
     """Integration tests for signup and unregister flow."""
     
-    def test_signup_then_unregister(self, client):
+    def test_signup_then_unregister(self, asgi_client):
         """Test signing up and then unregistering"""
         email = "testuser@mergington.edu"
-        activity = "Chess Club"
         
         # Sign up
-        signup_response = client.post(f"/activities/{activity}/signup?email={email}")
+        signup_response = asgi_client.post(_SIGNUP_URL(_CHESS, email))
         assert signup_response.status_code == 200
         
-        # Verify signup
-        activities_response = client.get("/activities")
-        assert email in activities_response.json()[activity]["participants"]
-        
         # Unregister
-        unregister_response = client.delete(f"/activities/{activity}/unregister?email={email}")
+        unregister_response = asgi_client.delete(_UNREGISTER_URL(_CHESS, email))
         assert unregister_response.status_code == 200
         
         # Verify unregister
-        final_response = client.get("/activities")
-        assert email not in final_response.json()[activity]["participants"]
+        assert email not in activities["Chess Club"]["participants"]
         
-    def test_multiple_signups_and_unregisters(self, client):
+    @pytest.mark.anyio
+    async def test_multiple_signups_and_unregisters(self, aclient):
         """Test multiple signup and unregister operations"""
-        activity = "Programming Class"
         emails = ["student1@mergington.edu", "student2@mergington.edu", "student3@mergington.edu"]
         
         # Sign up all students
-        for email in emails:
-            response = client.post(f"/activities/{activity}/signup?email={email}")
-            assert response.status_code == 200
+        responses = await asyncio.gather(*[
+            aclient.post(_SIGNUP_URL(_PROGRAMMING, email))
+            for email in emails
+        ])
+        assert all(response.status_code == 200 for response in responses)
         
         # Verify all signed up
-        response = client.get("/activities")
-        participants = response.json()[activity]["participants"]
-        for email in emails:
-            assert email in participants
+        participants = set(activities["Programming Class"]["participants"])
+        assert set(emails) <= participants
         
         # Unregister half of them
-        for email in emails[:2]:
-            response = client.delete(f"/activities/{activity}/unregister?email={email}")
-            assert response.status_code == 200
+        responses = await asyncio.gather(*[
+            aclient.delete(_UNREGISTER_URL(_PROGRAMMING, email))
+            for email in emails[:2]
+        ])
+        assert all(response.status_code == 200 for response in responses)
         
         # Verify unregistration
-        response = client.get("/activities")
-        participants = response.json()[activity]["participants"]
-        assert emails[0] not in participants
-        assert emails[1] not in participants
+        participants = set(activities["Programming Class"]["participants"])
+        assert participants.isdisjoint(emails[:2])
         assert emails[2] in participants